@@ -4,6 +4,7 @@ adventure game.
 """
 import random
 import math
+from abc import abstractmethod
 from turtle import RawTurtle
 from gamelib import Game, GameElement
 
@@ -36,10 +37,14 @@ class Waypoint(TurtleGameElement):
         self.__id1: int
         self.__id2: int
         self.__active: bool = False
+        self.__rendered_pos: tuple[float, float] | None = None
 
     def create(self) -> None:
-        self.__id1 = self.canvas.create_line(0, 0, 0, 0, width=2, fill="green")
-        self.__id2 = self.canvas.create_line(0, 0, 0, 0, width=2, fill="green")
+        # start off-canvas, which is where an inactive waypoint is kept
+        self.__id1 = self.canvas.create_line(-100, -100, -100, -100, width=2,
+                                             fill="green", tags="waypoint")
+        self.__id2 = self.canvas.create_line(-100, -100, -100, -100, width=2,
+                                             fill="green", tags="waypoint")
 
     def delete(self) -> None:
         self.canvas.delete(self.__id1)
@@ -50,16 +55,10 @@ class Waypoint(TurtleGameElement):
         pass
 
     def render(self) -> None:
-        if self.is_active:
-            self.canvas.itemconfigure(self.__id1, state="normal")
-            self.canvas.itemconfigure(self.__id2, state="normal")
-            self.canvas.tag_raise(self.__id1)
-            self.canvas.tag_raise(self.__id2)
-            self.canvas.coords(self.__id1, self.x-10, self.y-10, self.x+10, self.y+10)
-            self.canvas.coords(self.__id2, self.x-10, self.y+10, self.x+10, self.y-10)
-        else:
-            self.canvas.itemconfigure(self.__id1, state="hidden")
-            self.canvas.itemconfigure(self.__id2, state="hidden")
+        if self.is_active and self.__rendered_pos != (self.x, self.y):
+            self.__rendered_pos = (self.x, self.y)
+            self.game.queue_coords(self.__id1, self.x-10, self.y-10, self.x+10, self.y+10)
+            self.game.queue_coords(self.__id2, self.x-10, self.y+10, self.x+10, self.y-10)
 
     def activate(self, x: float, y: float) -> None:
         """
@@ -68,12 +67,19 @@ class Waypoint(TurtleGameElement):
         self.__active = True
         self.x = x
         self.y = y
+        # once the game is over, nothing must cover the game-over message
+        if not self.game.is_over:
+            self.canvas.tag_raise(self.__id1)
+            self.canvas.tag_raise(self.__id2)
 
     def deactivate(self) -> None:
         """
-        Mark this waypoint as inactive.
+        Mark this waypoint as inactive and move it out of view.
         """
         self.__active = False
+        self.__rendered_pos = None
+        self.game.queue_coords(self.__id1, -100, -100, -100, -100)
+        self.game.queue_coords(self.__id2, -100, -100, -100, -100)
 
     @property
     def is_active(self) -> bool:
@@ -118,11 +124,11 @@ class Home(TurtleGameElement):
         pass
 
     def render(self) -> None:
-        self.canvas.coords(self.__id, 
-        self.x - self.size/2, 
-        self.y - self.size/2, 
-        self.x + self.size/2, 
-        self.y + self.size/2)
+        self.game.queue_coords(self.__id,
+                               self.x - self.size/2,
+                               self.y - self.size/2,
+                               self.x + self.size/2,
+                               self.y + self.size/2)
 
     def contains(self, x: float, y: float):
         """
@@ -145,6 +151,7 @@ class Player(TurtleGameElement):
         super().__init__(game)
         self.__speed: float = speed
         self.__turtle: RawTurtle = turtle
+        self.__drawn_state: tuple | None = None
 
     def create(self) -> None:
         turtle = RawTurtle(self.canvas)
@@ -171,19 +178,39 @@ class Player(TurtleGameElement):
 
     def update(self) -> None:
         # check if player has arrived home
-        if self.game.home.contains(self.x, self.y):
+        x, y = self.x, self.y
+        if self.game.home.contains(x, y):
             self.game.game_over_win()
-        turtle = self.__turtle
         waypoint = self.game.waypoint
-        if self.game.waypoint.is_active:
-            turtle.setheading(turtle.towards(waypoint.x, waypoint.y))
-            turtle.forward(self.speed)
-            if turtle.distance(waypoint.x, waypoint.y) < self.speed:
+        if waypoint.is_active:
+            speed = self.speed
+            dx = waypoint.x - x
+            dy = waypoint.y - y
+            distance = math.hypot(dx, dy)
+            if distance < speed:
                 waypoint.deactivate()
+            else:
+                # headings are measured in the turtle's world coordinates,
+                # which are the same as the canvas coordinates here
+                turtle = self.__turtle
+                turtle.setheading(math.degrees(math.atan2(dy, dx)))
+                scale = speed / distance
+                turtle.goto(x + dx*scale, y + dy*scale)
 
     def render(self) -> None:
         self.__turtle.goto(self.x, self.y)
-        self.__turtle.getscreen().update()
+
+    def refresh(self) -> None:
+        """
+        Redraw the turtle on screen if it has moved or turned since the last
+        refresh.  With the turtle's tracer disabled, this is the only place
+        where the turtle screen gets updated.
+        """
+        turtle = self.__turtle
+        state = (turtle.position(), turtle.heading())
+        if state != self.__drawn_state:
+            self.__drawn_state = state
+            turtle.getscreen().update()
 
     # override original property x's getter/setter to use turtle's methods
     # instead
@@ -211,13 +238,33 @@ class Enemy(TurtleGameElement):
     Define an abstract enemy for the Turtle's adventure game
     """
 
+    # pylint: disable=too-many-instance-attributes
+
+    # x and y are plain slots here, shadowing GameElement's properties, so
+    # that reading and writing them, many times per frame by every enemy,
+    # involves no property call; state read by the per-type step_all() and
+    # render_all() loops is kept in public slots for the same reason
+    __slots__ = ("x", "y", "half", "half_int", "__size", "__color",
+                 "item", "last_x", "last_y")
+
+    # kind of canvas item representing the enemy, e.g., "oval" or "rectangle"
+    SHAPE = "oval"
+
     def __init__(self,
                 game: "TurtleAdventureGame",
                 size: int,
                 color: str):
         super().__init__(game)
+        self.x: float = 0
+        self.y: float = 0
         self.__size = size
         self.__color = color
+        self.half: float = size * 0.5
+        self.half_int: int = size // 2
+        self.item: int | None = None
+        # last rendered position, in whole pixels
+        self.last_x: int = 0
+        self.last_y: int = 0
 
     @property
     def size(self) -> float:
@@ -233,14 +280,64 @@ class Enemy(TurtleGameElement):
         """
         return self.__color
 
+    def create(self) -> None:
+        # the canvas item is kept at whole-pixel positions, which is all the
+        # screen can show anyway
+        x, y, half = int(self.x), int(self.y), self.half_int
+        create_item = getattr(self.canvas, f"create_{self.SHAPE}")
+        self.item = create_item(x - half, y - half, x + half, y + half,
+                                fill=self.color,
+                                tags=("enemy", type(self).__name__))
+        # new items go on top of the canvas, so put this one back below the
+        # waypoint, which is raised above every enemy when activated
+        self.canvas.tag_lower(self.item, "waypoint")
+        self.last_x = x
+        self.last_y = y
+
+    def update(self) -> None:
+        # the game updates enemies in bulk with step_all(); this is the same
+        # step for a single enemy
+        type(self).step_all(self.game, [self])
+
+    def render(self) -> None:
+        type(self).render_all(self.game, [self])
+
+    @classmethod
+    @abstractmethod
+    def step_all(cls, game: "TurtleAdventureGame", enemies: list["Enemy"]) -> None:
+        """
+        Update all the given enemies, all of this type, for one frame in a
+        single loop
+        """
+
+    @classmethod
+    def render_all(cls, game: "TurtleAdventureGame", enemies: list["Enemy"]) -> None:
+        """
+        Render all the given enemies in a single loop
+        """
+        queue_move = game.queue_move
+        for enemy in enemies:
+            x, y = int(enemy.x), int(enemy.y)
+            last_x, last_y = enemy.last_x, enemy.last_y
+            if x != last_x or y != last_y:
+                queue_move(enemy.item, x - last_x, y - last_y)
+                enemy.last_x = x
+                enemy.last_y = y
+
+    def delete(self) -> None:
+        self.canvas.delete(self.item)
+        self.item = None
+
     def hits_player(self):
         """
         Check whether the enemy is hitting the player
         """
+        x, y, half = self.x, self.y, self.half
+        player_x, player_y = self.game.player_pos
         return (
-            (self.x - self.size/2 < self.game.player.x < self.x + self.size/2)
+            (x - half < player_x < x + half)
             and
-            (self.y - self.size/2 < self.game.player.y < self.y + self.size/2)
+            (y - half < player_y < y + half)
         )
 
 
@@ -255,31 +352,19 @@ class DemoEnemy(Enemy):
     Demo enemy
     """
 
-    def __init__(self,
-                game: "TurtleAdventureGame",
-                size: int,
-                color: str):
-        super().__init__(game, size, color)
-        self.__id = None
-
-    def create(self) -> None:
-        self.__id = self.canvas.create_oval(0, 0, 0, 0, fill=self.color)
-
-    def update(self) -> None:
-        self.x += 1
-        self.y += 1
-        if self.hits_player():
-            self.game.game_over_lose()
-
-    def render(self) -> None:
-        self.canvas.coords(self.__id,
-                            self.x - self.size/2,
-                            self.y - self.size/2,
-                            self.x + self.size/2,
-                            self.y + self.size/2)
+    __slots__ = ()
 
-    def delete(self) -> None:
-        pass
+    @classmethod
+    def step_all(cls, game: "TurtleAdventureGame", enemies: list["DemoEnemy"]) -> None:
+        """
+        Move all the given demo enemies one pixel diagonally
+        """
+        move = game.grid.move
+        for enemy in enemies:
+            old_xy = (enemy.x, enemy.y)
+            enemy.x += 1
+            enemy.y += 1
+            move(enemy, old_xy, (enemy.x, enemy.y))
 
 class EnemyGenerator:
     """
@@ -287,14 +372,19 @@ class EnemyGenerator:
     kinds and scheduling them to appear at certain points in time.
     """
 
+    # maximum number of enemies of each kind alive at once, per game level
+    MAX_RANDOM_ENEMIES = 20
+    MAX_CHASING_ENEMIES = 10
+    MAX_TELEPORTING_ENEMIES = 30
+
     def __init__(self, game: "TurtleAdventureGame", level: int):
         self.__game: TurtleAdventureGame = game
         self.__level: int = level
 
-        self.__game.after(1000, self.create_random_enemy)
-        self.__game.after(2000, self.create_chasing_enemy)
-        self.__game.after(3000, self.create_fencing_enemy)
-        self.__game.after(4000, self.create_teleporting_enemy)
+        self.__schedule(1000, self.create_random_enemy)
+        self.__schedule(2000, self.create_chasing_enemy)
+        self.__schedule(3000, self.create_fencing_enemy)
+        self.__schedule(4000, self.create_teleporting_enemy)
 
     @property
     def game(self) -> "TurtleAdventureGame":
@@ -310,84 +400,101 @@ class EnemyGenerator:
         """
         return self.__level
 
+    def __schedule(self, delay_ms: int, create_enemies) -> None:
+        """
+        Call create_enemies after delay_ms milliseconds, unless the game is
+        over by then
+        """
+        def create_unless_over():
+            if not self.__game.is_over:
+                create_enemies()
+        self.__game.after(delay_ms, create_unless_over)
+
     def create_random_enemy(self):
-            random_enemy = RandomWalkEnemy(self.__game, 20, "red")
-            if random_enemy.x != 100 and random_enemy.y != 100:
-                random_enemy.x = random.randint(0, 700)
-                random_enemy.y = random.randint(0, 400)
-            self.game.add_element(random_enemy)
-            self.game.after(1000, self.create_random_enemy)
+            max_enemies = self.MAX_RANDOM_ENEMIES * self.__level
+            if len(self.game.enemies_of_type(RandomWalkEnemy)) < max_enemies:
+                random_enemy = RandomWalkEnemy(self.__game, 20, "red")
+                random_enemy.x = random.random() * 700
+                random_enemy.y = random.random() * 400
+                self.game.add_enemy(random_enemy)
+            self.__schedule(1000, self.create_random_enemy)
     def create_chasing_enemy(self):
-            chasing_enemy = ChasingEnemy(self.__game, size=20, color="purple")
-            chasing_enemy.x = random.randint(0, self.__game.screen_width)
-            chasing_enemy.y = random.randint(0, self.__game.screen_height)
-            self.__game.add_enemy(chasing_enemy)
-            self.__game.after(1000, self.create_chasing_enemy)
+            max_enemies = self.MAX_CHASING_ENEMIES * self.__level
+            if len(self.__game.enemies_of_type(ChasingEnemy)) < max_enemies:
+                chasing_enemy = ChasingEnemy(self.__game, size=20, color="purple")
+                chasing_enemy.x = random.random() * self.__game.screen_width
+                chasing_enemy.y = random.random() * self.__game.screen_height
+                self.__game.add_enemy(chasing_enemy)
+            self.__schedule(1000, self.create_chasing_enemy)
     def create_fencing_enemy(self):
             max_distance_from_home = 25
+            home = self.__game.home
+            # the circle circumscribing home, outside of which no point lies
+            # inside home
+            min_distance_from_home = home.size/2 * math.sqrt(2)
             for i in range(15):
                 fencing_enemy = FencingEnemy(self.__game, 20, "blue")
-                if fencing_enemy.x != self.game.home.x and fencing_enemy.y != self.game.home.y:
-                    fencing_enemy.x = random.randint(self.__game.home.x - max_distance_from_home, self.__game.home.x + max_distance_from_home)
-                    fencing_enemy.y = random.randint(self.__game.home.y - max_distance_from_home, self.__game.home.y + max_distance_from_home)
-                while self.__game.home.contains(fencing_enemy.x, fencing_enemy.y):
-                    fencing_enemy.x = random.randint(self.__game.home.x - max_distance_from_home, self.__game.home.x + max_distance_from_home)
-                    fencing_enemy.y = random.randint(self.__game.home.y - max_distance_from_home, self.__game.home.y + max_distance_from_home)
+                angle = random.uniform(0, 2*math.pi)
+                distance = random.uniform(min_distance_from_home, max_distance_from_home)
+                fencing_enemy.x = home.x + distance*math.cos(angle)
+                fencing_enemy.y = home.y + distance*math.sin(angle)
                 self.__game.add_enemy(fencing_enemy)
     def create_teleporting_enemy(self):
-            for _ in range(5):
+            max_enemies = self.MAX_TELEPORTING_ENEMIES * self.__level
+            room = max_enemies - len(self.__game.enemies_of_type(TeleportingEnemy))
+            for _ in range(min(5, room)):
                 teleporting_enemy = TeleportingEnemy(self.__game, size=20, color="black")
-                if teleporting_enemy.x != 100 and teleporting_enemy.y != 100:
-                    teleporting_enemy.x = random.randint(0, self.__game.screen_width)
-                    teleporting_enemy.y = random.randint(0, self.__game.screen_height)
+                teleporting_enemy.x = random.random() * self.__game.screen_width
+                teleporting_enemy.y = random.random() * self.__game.screen_height
                 self.__game.add_enemy(teleporting_enemy)
-            self.__game.after(500, self.create_teleporting_enemy)
+            self.__schedule(500, self.create_teleporting_enemy)
         
 class RandomWalkEnemy(Enemy):
     """
     Random enemy that walks in different directions and bounces off edges
     """
 
+    __slots__ = ("dx", "dy", "__speed")
+
     def __init__(self,
                 game: "TurtleAdventureGame",
                 size: int,
                 color: str):
         super().__init__(game, size, color)
-        self.__id = None
-        self.__dx = 0  # Change in x-coordinate (speed in x-direction)
-        self.__dy = 0  # Change in y-coordinate (speed in y-direction)
+        self.dx = 0  # Change in x-coordinate (speed in x-direction)
+        self.dy = 0  # Change in y-coordinate (speed in y-direction)
         self.__speed = 3  # Overall speed of the enemy
 
     def create(self) -> None:
-        self.__id = self.canvas.create_oval(0, 0, 0, 0, fill='red')
+        super().create()
         self.__choose_random_direction()
 
-    def update(self) -> None:
-        self.x += self.__dx
-        self.y += self.__dy
-
-        if self.x + self.size/2 >= self.game.screen_width:
-            self.__dx *= -1  # Reverse x on hitting right 
-        elif self.x - self.size/2 <= 0:
-            self.__dx *= -1  # Reverse x on hitting left 
-
-        if self.y + self.size/2 >= self.game.screen_height:
-            self.__dy *= -1  # Reverse y on hitting top 
-        elif self.y - self.size/2 <= 0:
-            self.__dy *= -1  # Reverse y on hitting bottom
-
-        if self.hits_player():
-            self.game.game_over_lose()
-
-    def render(self) -> None:
-        self.canvas.coords(self.__id,
-                            self.x - self.size/2,
-                            self.y - self.size/2,
-                            self.x + self.size/2,
-                            self.y + self.size/2)
-
-    def delete(self) -> None:
-        pass
+    @classmethod
+    def step_all(cls, game: "TurtleAdventureGame", enemies: list["RandomWalkEnemy"]) -> None:
+        """
+        Move all the given random walk enemies one step, bouncing them off
+        the screen edges
+        """
+        width = game.screen_width
+        height = game.screen_height
+        move = game.grid.move
+        for enemy in enemies:
+            x, y = enemy.x, enemy.y
+            dx, dy = enemy.dx, enemy.dy
+            half = enemy.half
+            new_x = x + dx
+            new_y = y + dy
+
+            # Reverse on hitting left or right
+            if new_x + half >= width or new_x - half <= 0:
+                enemy.dx = -dx
+            # Reverse on hitting top or bottom
+            if new_y + half >= height or new_y - half <= 0:
+                enemy.dy = -dy
+
+            enemy.x = new_x
+            enemy.y = new_y
+            move(enemy, (x, y), (new_x, new_y))
 
     def __choose_random_direction(self):
         """
@@ -395,164 +502,226 @@ class RandomWalkEnemy(Enemy):
         """
         direction = random.choice(["up", "down", "left", "right"])
         if direction == "up":
-            self.__dx = 0
-            self.__dy = self.__speed
+            self.dx = 0
+            self.dy = self.__speed
         elif direction == "down":
-            self.__dx = 0
-            self.__dy = -self.__speed
+            self.dx = 0
+            self.dy = -self.__speed
         elif direction == "left":
-            self.__dx = -self.__speed
-            self.__dy = 0
+            self.dx = -self.__speed
+            self.dy = 0
         else: 
-            self.__dx = self.__speed
-            self.__dy = 0
+            self.dx = self.__speed
+            self.dy = 0
 
 class ChasingEnemy(Enemy):
     """
     Chasing enemy
     """
 
+    __slots__ = ("speed",)
+
     def __init__(self, game: "TurtleAdventureGame", size: int, color: str):
         super().__init__(game, size, color)
-        self.__id = None
-        self.__speed = 4  # Adjust speed as needed
-
-    def create(self) -> None:
-        self.__id = self.canvas.create_oval(0, 0, 0, 0, fill=self.color)
-
-    def update(self) -> None:
-        player_x = self.game.player.x
-        player_y = self.game.player.y
-        enemy_speed = self.__speed
+        self.speed = 4  # Adjust speed as needed
 
-        # Calculate the vector from enemy to player
-        dx = player_x - self.x
-        dy = player_y - self.y
-
-        # Move towards the player along the normalized vector
-        distance = (dx**2 + dy**2)**0.5
-        if distance > 0:
-            normalized_dx = dx / distance
-            normalized_dy = dy / distance
-
-            self.x += normalized_dx * enemy_speed
-            self.y += normalized_dy * enemy_speed
-
-        if self.hits_player():
-            self.game.game_over_lose()
+    @classmethod
+    def step_all(cls, game: "TurtleAdventureGame", enemies: list["ChasingEnemy"]) -> None:
+        """
+        Move all the given chasing enemies one step towards the player
+        """
+        player_x, player_y = game.player_pos
+        move = game.grid.move
+        for enemy in enemies:
+            x, y = enemy.x, enemy.y
 
-    def render(self) -> None:
-        self.canvas.coords(self.__id,
-                            self.x - self.size/2,
-                            self.y - self.size/2,
-                            self.x + self.size/2,
-                            self.y + self.size/2)
+            # Calculate the vector from enemy to player
+            dx = player_x - x
+            dy = player_y - y
 
-    def delete(self) -> None:
-        pass
+            # Move towards the player along the normalized vector, scaled to
+            # the enemy's speed with a single division
+            distance = math.hypot(dx, dy)
+            if distance > 0:
+                scale = enemy.speed / distance
+                new_x = x + dx * scale
+                new_y = y + dy * scale
+                enemy.x = new_x
+                enemy.y = new_y
+                move(enemy, (x, y), (new_x, new_y))
 
 class FencingEnemy(Enemy):
     """
     Fencing enemy that moves around the home in a square form
     """
 
-    def __init__(self, game: "TurtleAdventureGame", size: int, color: str):
-        super().__init__(game, size, color)
-        self.__id = None
-        self.__speed = 4  # Adjust speed as needed
-        self.__direction = "right"  # Initial movement direction
+    __slots__ = ("direction",)
 
-    def create(self) -> None:
-        self.__id = self.canvas.create_oval(0, 0, 0, 0, fill=self.color)
+    SPEED = 4
+    SQUARE_SIZE = 80
 
-    def update(self) -> None:
-        # Determine the boundaries of the square around the home
-        home_x, home_y = self.game.home.x, self.game.home.y
-        square_size = 80  # Adjust the size of the square as needed
-        square_left = home_x - square_size / 2
-        square_right = home_x + square_size / 2
-        square_top = home_y - square_size / 2
-        square_bottom = home_y + square_size / 2
-
-        # Move the enemy based on the current direction
-        if self.__direction == "right":
-            self.x += self.__speed
-            if self.x >= square_right:
-                self.x = square_right
-                self.__direction = "down"
-        elif self.__direction == "down":
-            self.y += self.__speed
-            if self.y >= square_bottom:
-                self.y = square_bottom
-                self.__direction = "left"
-        elif self.__direction == "left":
-            self.x -= self.__speed
-            if self.x <= square_left:
-                self.x = square_left
-                self.__direction = "up"
-        elif self.__direction == "up":
-            self.y -= self.__speed
-            if self.y <= square_top:
-                self.y = square_top
-                self.__direction = "right"
-
-        if self.hits_player():
-            self.game.game_over_lose()
+    # Directions in patrol order: right, down, left, up.  Even directions move
+    # along x, odd ones along y; the first two move forward, the rest backward.
+    __SIGNS = (1, 1, -1, -1)
 
-    def render(self) -> None:
-        self.canvas.coords(self.__id,
-                        self.x - self.size / 2,
-                        self.y - self.size / 2,
-                        self.x + self.size / 2,
-                        self.y + self.size / 2)
+    def __init__(self, game: "TurtleAdventureGame", size: int, color: str):
+        super().__init__(game, size, color)
+        self.direction: int = 0  # Initially moving right
+
+    @classmethod
+    def patrol_limits(cls, home: Home) -> tuple[float, float, float, float]:
+        """
+        Get the boundaries of the square around the home, indexed by the
+        direction that stops at each of them
+        """
+        half_square = cls.SQUARE_SIZE / 2
+        return (home.x + half_square, home.y + half_square,
+                home.x - half_square, home.y - half_square)
+
+    @classmethod
+    def step_all(cls, game: "TurtleAdventureGame", enemies: list["FencingEnemy"]) -> None:
+        """
+        Move all the given fencing enemies one step along their square
+        """
+        limits = cls.patrol_limits(game.home)
+        signs = cls.__SIGNS
+        speed = cls.SPEED
+        move = game.grid.move
+
+        for enemy in enemies:
+            direction = enemy.direction
+            sign = signs[direction]
+            limit = limits[direction]
+            x, y = enemy.x, enemy.y
+            if direction & 1:
+                new_x = x
+                new_y = y + sign*speed
+                if (new_y - limit)*sign >= 0:
+                    new_y = limit
+                    enemy.direction = (direction + 1) & 3
+            else:
+                new_x = x + sign*speed
+                new_y = y
+                if (new_x - limit)*sign >= 0:
+                    new_x = limit
+                    enemy.direction = (direction + 1) & 3
+            enemy.x = new_x
+            enemy.y = new_y
+            move(enemy, (x, y), (new_x, new_y))
 
-    def delete(self) -> None:
-        pass    
 
 class TeleportingEnemy(Enemy):
     """
     Teleporting Enemy appears near the player or home randomly.
     """
 
+    __slots__ = ("teleport_cooldown", "teleport_counter")
+
+    SHAPE = "rectangle"
+
     def __init__(self, game: "TurtleAdventureGame", size: int, color: str):
         super().__init__(game, size, color)
-        self.__id = None
-        self.__teleport_cooldown = 60  # Cooldown between teleports (in frames)
-        self.__teleport_counter = 0
+        self.teleport_cooldown = 60  # Cooldown between teleports (in frames)
+        self.teleport_counter = 0
 
-    def create(self) -> None:
-        self.__id = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.color)
+    @classmethod
+    def step_all(cls, game: "TurtleAdventureGame", enemies: list["TeleportingEnemy"]) -> None:
+        """
+        Count down the cooldown of all the given teleporting enemies and
+        teleport those whose cooldown has elapsed
+        """
+        move = game.grid.move
+        for enemy in enemies:
+            enemy.teleport_counter += 1
+            if enemy.teleport_counter >= enemy.teleport_cooldown:
+                old_xy = (enemy.x, enemy.y)
+                enemy.teleport()
+                enemy.teleport_counter = 0
+                move(enemy, old_xy, (enemy.x, enemy.y))
 
-    def update(self) -> None:
-        self.__teleport_counter += 1
-        if self.__teleport_counter >= self.__teleport_cooldown:
-            self.teleport()
-            self.__teleport_counter = 0
+    def teleport(self) -> None:
+        """
+        Teleport the enemy near the player or home randomly.
+        """
+        # a single draw picks both the target and the two offsets in
+        # [-200, 200]: 2 targets x 401 x-offsets x 401 y-offsets
+        n = int(random.random() * (2*401*401))
+        n, near_player = divmod(n, 2)
+        offset_y, offset_x = divmod(n, 401)
+        if near_player:
+            target_x, target_y = self.game.player_pos
+        else:
+            target_x, target_y = self.game.home.x, self.game.home.y
+        self.x = target_x + offset_x - 200
+        self.y = target_y + offset_y - 200
 
-        if self.hits_player():
-            self.game.game_over_lose()
 
-    def render(self) -> None:
-        self.canvas.coords(self.__id,
-                        self.x - self.size / 2,
-                        self.y - self.size / 2,
-                        self.x + self.size / 2,
-                        self.y + self.size / 2)
+class SpatialGrid:
+    """
+    A uniform grid of square cells used to look up enemies near a point
+    without testing every enemy in the game.
+    """
 
-    def delete(self) -> None:
-        pass
+    def __init__(self, cell_size: int):
+        self.__cell_size: int = cell_size
+        self.__cells: dict[tuple[int, int], set[Enemy]] = {}
 
-    def teleport(self) -> None:
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
         """
-        Teleport the enemy near the player or home randomly.
+        Get the cell containing the point (x, y)
         """
-        choice = random.choice(["player", "home"])
-        if choice == "player":
-            self.x = self.game.player.x + random.randint(-200, 200)
-            self.y = self.game.player.y + random.randint(-200, 200)
-        else:
-            self.x = self.game.home.x + random.randint(-200, 200)
-            self.y = self.game.home.y + random.randint(-200, 200)
+        return int(x)//self.__cell_size, int(y)//self.__cell_size
+
+    def insert(self, enemy: Enemy) -> None:
+        """
+        Add an enemy to the cell containing its current position
+        """
+        self.__cells.setdefault(self.cell_of(enemy.x, enemy.y), set()).add(enemy)
+
+    def remove(self, enemy: Enemy) -> None:
+        """
+        Remove an enemy from the cell containing its current position
+        """
+        cell = self.cell_of(enemy.x, enemy.y)
+        members = self.__cells.get(cell)
+        if members is not None:
+            members.discard(enemy)
+            if not members:
+                del self.__cells[cell]
+
+    def move(self,
+             enemy: Enemy,
+             old_xy: tuple[float, float],
+             new_xy: tuple[float, float]) -> None:
+        """
+        Update the cell of an enemy that has moved from old_xy to new_xy
+        """
+        old_cell = self.cell_of(*old_xy)
+        new_cell = self.cell_of(*new_xy)
+        if old_cell == new_cell:
+            return
+        members = self.__cells.get(old_cell)
+        if members is not None:
+            members.discard(enemy)
+            if not members:
+                del self.__cells[old_cell]
+        self.__cells.setdefault(new_cell, set()).add(enemy)
+
+    def query(self, x: float, y: float) -> list[Enemy]:
+        """
+        Get all enemies in the cell containing (x, y) and its eight
+        neighbours, i.e., every enemy no larger than a cell that may overlap
+        the point
+        """
+        cx, cy = self.cell_of(x, y)
+        cells = self.__cells
+        found = []
+        for i in (cx-1, cx, cx+1):
+            for j in (cy-1, cy, cy+1):
+                members = cells.get((i, j))
+                if members:
+                    found.extend(members)
+        return found
 
 
 class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
@@ -567,9 +736,17 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
         self.screen_height: int = screen_height
         self.waypoint: Waypoint
         self.player: Player
+        # the player's position, read once per frame from its turtle after
+        # the player has moved
+        self.player_pos: tuple[float, float] = (0, 0)
         self.home: Home
         self.enemies: list[Enemy] = []
+        self.grid: SpatialGrid = SpatialGrid(cell_size=20)
+        self.__enemy_groups: dict[type, list[Enemy]] = {}
         self.enemy_generator: EnemyGenerator
+        self.__render_queue: list[tuple] = []
+        self.__end_text: int
+        self.__is_over: bool = False
         super().__init__(parent)
 
     def init_game(self):
@@ -585,41 +762,136 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
         self.player = Player(self, turtle)
         self.add_element(self.player)
         self.canvas.bind("<Button-1>", lambda e: self.waypoint.activate(e.x, e.y))
+        # the game-over message, shown by game_over_win()/game_over_lose()
+        self.__end_text = self.canvas.create_text(self.screen_width/2,
+                                                  self.screen_height/2,
+                                                  text="",
+                                                  font=("Arial", 36, "bold"),
+                                                  state="hidden")
 
         self.enemy_generator = EnemyGenerator(self, level=self.level)
 
         self.player.x = 50
         self.player.y = self.screen_height//2
 
+    def animate(self) -> None:
+        if not self.is_started:
+            return
+        # update the player first, so that enemies react to where it is now
+        super().animate()
+        groups = self.__enemy_groups
+        if self.is_started:
+            self.player_pos = (self.player.x, self.player.y)
+            for enemy_type, enemies in groups.items():
+                enemy_type.step_all(self, enemies)
+            self.check_collisions()
+        for enemies in groups.values():
+            Enemy.render_all(self, enemies)
+        self.flush_render()
+        self.player.refresh()
+        if self.is_over:
+            # refreshing the turtle screen redraws the player's turtle above
+            # every other item, so put the game-over message back on top
+            self.canvas.tag_raise(self.__end_text)
+
+    def check_collisions(self) -> None:
+        """
+        Check the enemies around the player and end the game if one of them
+        hits the player
+        """
+        for enemy in self.grid.query(*self.player_pos):
+            if enemy.hits_player():
+                self.game_over_lose()
+                return
+
+    def queue_move(self, item: int, dx: int, dy: int) -> None:
+        """
+        Queue moving a canvas item by a whole number of pixels, to be sent to
+        Tk by the next flush_render()
+        """
+        self.__render_queue.append(("move", item, dx, dy))
+
+    def queue_coords(self, item: int,
+                     x1: float, y1: float, x2: float, y2: float) -> None:
+        """
+        Queue new coordinates of a canvas item, truncated to whole pixels like
+        every other canvas position in this game
+        """
+        self.__render_queue.append(
+            ("coords", item, int(x1), int(y1), int(x2), int(y2)))
+
+    def flush_render(self) -> None:
+        """
+        Send all queued canvas commands to Tk as a single Tcl script; every
+        queued argument is an int, so none needs quoting
+        """
+        if not self.__render_queue:
+            return
+        widget = str(self.canvas)
+        script = "\n".join(f"{widget} {' '.join(map(str, args))}"
+                           for args in self.__render_queue)
+        self.__render_queue.clear()
+        self.canvas.tk.call("eval", script)
+
     def add_enemy(self, enemy: Enemy) -> None:
         """
         Add a new enemy into the current game
         """
         self.enemies.append(enemy)
-        self.add_element(enemy)
+        self.__enemy_groups.setdefault(type(enemy), []).append(enemy)
+        # enemies are not game elements; animate() updates and renders them
+        # one type at a time
+        enemy.create()
+        self.grid.insert(enemy)
+
+    def delete_enemy(self, enemy: Enemy) -> None:
+        """
+        Remove an enemy from the current game
+        """
+        self.grid.remove(enemy)
+        self.enemies.remove(enemy)
+        self.__enemy_groups[type(enemy)].remove(enemy)
+        enemy.delete()
+
+    def enemies_of_type(self, enemy_type: type) -> list[Enemy]:
+        """
+        Get all enemies in the game of exactly the given type
+        """
+        return self.__enemy_groups.get(enemy_type, [])
+
+    @property
+    def is_over(self) -> bool:
+        """
+        Get the flag indicating whether the game has been won or lost
+        """
+        return self.__is_over
 
     def game_over_win(self) -> None:
         """
         Called when the player wins the game and stop the game
         """
         self.stop()
-        font = ("Arial", 36, "bold")
-        self.canvas.create_text(self.screen_width/2,
-                                self.screen_height/2,
-                                text="You Win",
-                                font=font,
-                                fill="green")
+        self.__is_over = True
+        self.show_end_text("You Win", "green")
 
     def game_over_lose(self) -> None:
         """
         Called when the player loses the game and stop the game
         """
         self.stop()
-        font = ("Arial", 36, "bold")
-        self.canvas.create_text(self.screen_width/2,
-                                self.screen_height/2,
-                                text="You Lose",
-                                font=font,
-                                fill="red")
+        self.__is_over = True
+        self.show_end_text("You Lose", "red")
+
+    def show_end_text(self, text: str, color: str) -> None:
+        """
+        Hide all enemies and show the game-over message on top of all other
+        items
+        """
+        self.canvas.itemconfigure("enemy", state="hidden")
+        self.canvas.itemconfigure(self.__end_text, text=text, fill=color, state="normal")
+        # the text was created before any enemy, so raise it above every item
+        # existing now; animate() raises it once more after the last refresh
+        # of the player's turtle, which is drawn on top when redrawn
+        self.canvas.tag_raise(self.__end_text)
     
     